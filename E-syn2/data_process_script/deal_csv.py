@@ -1,29 +1,26 @@
 import csv
 import sys
+from collections import defaultdict
+from itertools import islice
 
 input_filename1 = sys.argv[1]
 output_filename = sys.argv[2]
-existing_table = {}
+existing_table = defaultdict(list)
 
 # Read the first input CSV file
-with open(input_filename1, 'r') as csvfile:
+with open(input_filename1, 'r', newline='') as csvfile:
     reader = csv.reader(csvfile)
     for row in reader:
-        op = row[0]
-        data = row[1:]
-        if op in existing_table:
-            existing_table[op].extend(data)
-        else:
-            existing_table[op] = data
+        # Rows sharing an op are concatenated in file order
+        existing_table[row[0]].extend(islice(row, 1, None))
 
 
 # Convert dictionary to list
 merged_table = [[op, *data] for op, data in existing_table.items()]
-merged_table[-1].insert(1, '0')
-merged_table[-1].insert(6, '0')
-merged_table[-1].insert(7, '0')
-merged_table[-1].insert(8, '0')
-merged_table[-1].insert(9, '0')
+# Pad the last row to the merged layout:
+# [op, '0', d0, d1, d2, d3, '0', '0', '0', '0', d4, ...]
+row = merged_table[-1]
+row[:] = row[:1] + ['0'] + row[1:5] + ['0', '0', '0', '0'] + row[5:]
 # Write to new CSV file
 with open(output_filename, 'w', newline='') as csvfile:
     writer = csv.writer(csvfile)
@@ -9,8 +9,8 @@ def load_jsons(files):
     js = []
     for file in files:
         try:
-            with open(file) as f:
-                j = json.load(f)
+            with open(file, "rb") as f:
+                j = json.loads(f.read())
                 j["json_path"] = file
                 js.append(j)
         except Exception as e:
@@ -1,31 +1,103 @@
 import os
-import json
-
-def process_json(input_file, a):
-    # Read input file
-    with open(input_file, 'r') as f:
-        data = json.load(f)
-
-    choices = data['choices']
-    values = list(choices.values())
-
+import multiprocessing
+from functools import partial
+try:
+    import orjson
+
+    def _loads(b):
+        return orjson.loads(b)
+
+    def _dumps(o):
+        return orjson.dumps(o, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+
+    def _loads(b):
+        return json.loads(b)
+
+    def _dumps(o):
+        return json.dumps(o, indent=2).encode()
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_GRAPH_DATA = None
+
+def iter_json_files(path):
+    # scandir reuses the dirent type, so no extra stat() per entry
+    return (entry for entry in os.scandir(path) if entry.is_file(follow_symlinks=False))
+
+def collect_choices(*input_dirs):
+    # Union of the node ids chosen by any result; only these are needed from the graph
+    wanted = set()
+    for input_dir in input_dirs:
+        for entry in iter_json_files(input_dir):
+            with open(entry.path, 'rb') as f:
+                wanted.update(_loads(f.read())['choices'].values())
+    return wanted
+
+def load_graph(wanted=None):
     # Read graph_internal_serd.json file
     input_dir = os.path.join(os.getcwd(), 'data', 'my_data')
     print(input_dir)
     files = os.listdir(input_dir)
     json_files = [file for file in files if file.endswith('.json')]
     graph_file = os.path.join(input_dir, json_files[0])
-    with open(graph_file, 'r') as f:
-         graph_data = json.load(f)
+    if ijson is None or wanted is None:
+        with open(graph_file, 'rb') as f:
+            return _loads(f.read())
+
+    # Stream the graph so peak memory follows the chosen nodes, not the e-graph
+    with open(graph_file, 'rb') as f:
+        nodes = {key: node for key, node in ijson.kvitems(f, 'nodes', use_float=True) if key in wanted}
+    with open(graph_file, 'rb') as f:
+        root_eclasses = list(ijson.items(f, 'root_eclasses.item', use_float=True))
+    return {'nodes': nodes, 'root_eclasses': root_eclasses}
+
+def _init_worker(wanted=None):
+    # Forked workers inherit the parent's graph; spawned ones parse it once here
+    global _GRAPH_DATA
+    if _GRAPH_DATA is None:
+        _GRAPH_DATA = load_graph(wanted)
+
+def run_parallel(func, input_dir, a, initializer=None, initargs=()):
+    # Every file is independent, so fan them out across all cores
+    paths = (entry.path for entry in iter_json_files(input_dir))
+    with multiprocessing.Pool(os.cpu_count(), initializer=initializer, initargs=initargs) as pool:
+        for _ in pool.imap_unordered(partial(func, a=a), paths, chunksize=16):
+            pass
+
+def process_json(input_file, a, graph_data=None):
+    # Read input file
+    with open(input_file, 'rb') as f:
+        data = _loads(f.read())
 
-    # Build new result dictionary, only keeping keys that exist in values list
-    new_nodes = {key: value for key, value in graph_data['nodes'].items() if key in values}
+    choices = data['choices']
 
-    # Build final result dictionary
+    # Build new result dictionary from the chosen nodes; walking the choices
+    # instead of the whole graph keeps this proportional to the solution size
+    if graph_data is None:
+        graph_data = _GRAPH_DATA
+    nodes = graph_data['nodes']
+    new_nodes = {key: nodes[key] for key in choices.values() if key in nodes}
+
+    # Remove decimal points and decimal parts from keys and "children"; the
+    # graph nodes are shared, so copy them rather than mutating in place
+    new_nodes = {
+        key.split('.', 1)[0]: {**value, 'children': [child.split('.', 1)[0] for child in value['children']]}
+        for key, value in new_nodes.items()
+    }
+
+    # Build final result dictionary; DAG results also carry the graph roots
     result = {'nodes': new_nodes}
+    if a == 0:
+        result['root_eclasses'] = graph_data.get('root_eclasses', [])
    
-    # Get the basename of input file
+    # Get the basename of input file, making sure the output ends in .json
     file_name = os.path.basename(input_file)
+    if not file_name.endswith('.json'):
+        file_name += '.json'
 
     # Build output file path
     if(a==1):
@@ -34,150 +106,26 @@ def process_json(input_file, a):
       output_file = os.path.join('out_process_dag_result1', file_name)
         
     # Output result
-    with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(_dumps(result))
 
     #print(f'Processing completed, result saved to file: {output_file}')
 
-def process_json1(input_file,a):
-    # Read input file
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+if __name__ == '__main__':
+    result_dir = os.path.join(os.getcwd(), 'out_json', 'my_data')
+    #result_dir = '/data/cchen/extraction-gym-new/extraction-gym/out_json/'
+    dag_dir = os.path.join(os.getcwd(), 'out_dag_json', 'my_data')
+    #dag_dir = '/data/cchen/extraction-gym-new/extraction-gym/out_dag_json/'
 
-    # Process decimal points and decimal parts in keys
-    new_nodes = {}
-    for key, value in data['nodes'].items():
-        new_key = key.split('.')[0]  # Remove decimal points and decimal parts
-        value['children'] = [child.split('.')[0] for child in value['children']]  # Process numbers in "children"
-        new_nodes[new_key] = value
+    # The chosen ids only pay off when the graph can be streamed
+    wanted = collect_choices(result_dir, dag_dir) if ijson is not None else None
+    _GRAPH_DATA = load_graph(wanted)
 
-    # Build final result dictionary
-    result = {'nodes': new_nodes}
-
-    # Get the basename of input file
-    file_name = os.path.basename(input_file)
-
-    # Build output file path
-    if(a==1):
-       output_dir = 'out_process_result1'
-    else :
-       output_dir = 'out_process_dag_result1'
+    # Iterate through all JSON files in the directory
+    output_dir = 'out_process_result1'
     os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, file_name)
-
-    # Output result
-    with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2)
-
-    #print(f'Processing completed, result saved to file: {output_file}')
-
-# Iterate through all JSON files in the directory
-output_dir = 'out_process_result1'
-os.makedirs(output_dir, exist_ok=True)
-input_dir = os.path.join(os.getcwd(), 'out_json', 'my_data')
-#input_dir = '/data/cchen/extraction-gym-new/extraction-gym/out_json/'
-files = [file for file in os.listdir(input_dir)]
-
-for file in files:
-    input_file = os.path.join(input_dir, file)
-
-    if os.path.isfile(input_file):
-        #print(f'Processing file: {input_file}')
-        process_json(input_file,1)
-    else:
-        print(f'File does not exist: {input_file}')
-
-output_dir = 'out_process_dag_result1'
-os.makedirs(output_dir, exist_ok=True)
-#input_dir = '/data/cchen/extraction-gym-new/extraction-gym/out_dag_json/'
-input_dir = os.path.join(os.getcwd(), 'out_dag_json', 'my_data')
-files = [file for file in os.listdir(input_dir)]
-
-for file in files:
-    input_file = os.path.join(input_dir, file)
-
-    if os.path.isfile(input_file):
-       # print(f'Processing file: {input_file}')
-        process_json(input_file,0)
-    else:
-        print(f'File does not exist: {input_file}')
-
-
-
-
-
-
-# Iterate through all files in the directory
-input_dir = os.path.join(os.getcwd(), 'out_process_result1')
-#input_dir = '/data/cchen/extraction-gym-new/extraction-gym/out_process_result/'
-files = [file for file in os.listdir(input_dir)]
-
-for file in files:
-    input_file = os.path.join(input_dir, file)
-
-    if os.path.isfile(input_file):
-      #  print(f'Processing file: {input_file}')
-        process_json1(input_file,1)
-    else:
-        print(f'File does not exist: {input_file}')
-
-input_dir = os.path.join(os.getcwd(), 'out_process_dag_result1') 
-#input_dir = '/data/cchen/extraction-gym-new/extraction-gym/out_process_dag_result/'
-files = [file for file in os.listdir(input_dir)]
-
-for file in files:
-    input_file = os.path.join(input_dir, file)
-
-    if os.path.isfile(input_file):
-     #   print(f'Processing file: {input_file}')
-        process_json1(input_file,0)
-    else:
-        print(f'File does not exist: {input_file}')
-
-
-input_dir = os.path.join(os.getcwd(), 'out_process_dag_result1')
-# input_dir = '/data/cchen/extraction-gym-new/extraction-gym/out_process_dag_result/'
-
-files = os.listdir(input_dir)
-
-for file in files:
-    input_file = os.path.join(input_dir, file)
-
-    if os.path.isfile(input_file):
-        filename, extension = os.path.splitext(input_file)
-        
-        if extension != '.json':
-            new_file = input_file + '.json'
-            os.rename(input_file, new_file)
-
-
-
-input_dir = os.path.join(os.getcwd(), 'data', 'my_data')
-print(input_dir)
-files = os.listdir(input_dir)
-json_files = [file for file in files if file.endswith('.json')]
-graph_file = os.path.join(input_dir, json_files[0])
-with open(graph_file, 'r') as f:
-    source_data = json.load(f)
-    root_eclasses = source_data.get("root_eclasses", [])
-
-
-output_dir = os.path.join(os.getcwd(), 'out_process_dag_result1')
-
-for filename in os.listdir(output_dir):
-    if filename.endswith(".json"):
-        target_file_path = os.path.join(output_dir, filename)
-
-        # Read target file content
-        with open(target_file_path, "r") as target_file:
-            target_data = json.load(target_file)
-
-        # Add key-value pair to data
-        target_data["root_eclasses"] = root_eclasses
-
-        # Write updated data to target file
-        with open(target_file_path, "w") as target_file:
-            json.dump(target_data, target_file, indent=4)
-
-
+    run_parallel(process_json, result_dir, 1, initializer=_init_worker, initargs=(wanted,))
 
+    output_dir = 'out_process_dag_result1'
+    os.makedirs(output_dir, exist_ok=True)
+    run_parallel(process_json, dag_dir, 0, initializer=_init_worker, initargs=(wanted,))
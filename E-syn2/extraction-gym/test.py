@@ -1,4 +1,23 @@
-import json
+import re
+try:
+    import orjson
+
+    def _loads(b):
+        return orjson.loads(b)
+
+    def _dumps(o):
+        return orjson.dumps(o, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+
+    def _loads(b):
+        return json.loads(b)
+
+    def _dumps(o):
+        return json.dumps(o, indent=2).encode()
+
+# Matches a selected node variable "N_<eclass>_<node> 1" (or 1.0) in a .sol file
+_SELECTED_NODE_RE = re.compile(rb'^N_(\d+)_(\d+)\s+1(?:\.0+)?\s*$')
 
 def transform_solution_to_json(sol_file, original_json_file, output_file):
     """
@@ -10,32 +29,30 @@ def transform_solution_to_json(sol_file, original_json_file, output_file):
         output_file: Path to output the extracted egraph JSON file
     """
     # Read the original saturated egraph to get node information
-    with open(original_json_file, 'r') as f:
-        original_data = json.load(f)
+    with open(original_json_file, 'rb') as f:
+        original_data = _loads(f.read())
     
     # Read the solution file and extract selected nodes
     selected_nodes = {}
+    nodes = original_data['nodes']
     
-    with open(sol_file, 'r') as f:
+    with open(sol_file, 'rb') as f:
         for line in f:
-            line = line.strip()
-            if line.startswith('#') or not line:
+            # Cheap prefix check skips comments, blank lines and non-node variables
+            if line[:2] != b'N_':
+                continue
+
+            # Parse variable name: N_eclass_node -> eclass, node
+            m = _SELECTED_NODE_RE.match(line)
+            if not m:
                 continue
-            
-            parts = line.split()
-            if len(parts) == 2:
-                var_name, value = parts[0], int(parts[1])
-                if value == 1 and var_name.startswith('N_'):
-                    # Parse variable name: N_eclass_node -> eclass, node
-                    parts = var_name.split('_')
-                    if len(parts) >= 3:
-                        eclass_id = parts[1]
-                        node_id = parts[2]
-                        node_key = f"{eclass_id}.{node_id}"
-                        
-                        # Check if this node exists in the original data
-                        if node_key in original_data['nodes']:
-                            selected_nodes[eclass_id] = node_key
+            eclass_id = m.group(1).decode()
+            node_id = m.group(2).decode()
+            node_key = f"{eclass_id}.{node_id}"
+
+            # Check if this node exists in the original data
+            if node_key in nodes:
+                selected_nodes[eclass_id] = node_key
     
     # Create the output JSON with choices mapping
     output_data = {
@@ -43,8 +60,8 @@ def transform_solution_to_json(sol_file, original_json_file, output_file):
     }
     
     # Write the output file
-    with open(output_file, 'w') as f:
-        json.dump(output_data, f, indent=4)
+    with open(output_file, 'wb') as f:
+        f.write(_dumps(output_data))
     
     print(f"Converted {len(selected_nodes)} choices from solution file to {output_file}")
 
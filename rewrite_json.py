@@ -1,5 +1,23 @@
-import json
 import os
+try:
+    import orjson
+
+    def _loads(b):
+        return orjson.loads(b)
+
+    def _dumps(o):
+        return orjson.dumps(o, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+
+    def _loads(b):
+        return json.loads(b)
+
+    def _dumps(o):
+        return json.dumps(o, indent=2).encode()
+
+# Check node id formats while rewriting; skipped entirely under `python -O`
+VALIDATE = True
 
 def is_int(s: str) -> bool:
     """Check if a string can be converted to an integer."""
@@ -10,17 +28,30 @@ def is_int(s: str) -> bool:
         return False
 
 def read_json_file(filename):
-    """Read JSON file with UTF-8 encoding to prevent Chinese character corruption."""
+    """Read JSON file as UTF-8 bytes to prevent Chinese character corruption."""
     try:
-        # Open JSON file with UTF-8 encoding to prevent character corruption
-        with open(filename, 'r', encoding='utf-8') as f:
-            # Use json.load() method to read JSON data
-            data = json.load(f)
+        # Read raw bytes; the parser decodes them as UTF-8 itself
+        with open(filename, 'rb') as f:
+            data = _loads(f.read())
         return data
     except Exception as e:
         print("Error reading JSON file:", e)
         return None
 
+def check_node(key, node):
+    """Assert that a node id and its children are canonical "cid.nid" strings."""
+    # A second "." would land in the nid part and fail is_int
+    for j in node['children']:
+        ccid, sep, cnid = j.partition(".")
+        assert sep
+        assert is_int(ccid) and is_int(cnid)
+
+    cid, sep, nid = key.partition(".")
+    assert sep
+    assert is_int(cid) and is_int(nid)
+    # The key is reused as the node id, so it must already be normalized
+    assert key == str(int(cid)) + "." + str(int(nid))
+
 if __name__ == "__main__":
     # Use relative paths from the extraction-tool root directory
     old_filename = "E-syn2/extraction-gym/input/rewritten_egraph_with_weight_cost_serd.json"
@@ -30,45 +61,26 @@ if __name__ == "__main__":
     if os.path.exists(new_filename):
         os.remove(new_filename)
     
-    # Read the original JSON data
+    # Read the original JSON data; it is rewritten in place
     json_data = read_json_file(old_filename)
-    new_json_data = json_data
     
     # Process each node in the graph
-    for i in new_json_data['nodes']:
-        # Convert children from string format to integer format
-        child = []
-        for j in json_data['nodes'][i]['children']:
-            assert "." in j
-            cid = j.split(".")
-            assert len(cid) == 2
-            ccid = cid[0]
-            cnid = cid[1]
-            assert is_int(ccid) and is_int(cnid)
-            cnum_cid = int(ccid)
-            child.append(cnum_cid)
-        
-        # Update children and eclass fields
-        new_json_data['nodes'][i]['children'] = child
-        new_json_data['nodes'][i]['eclass'] = int(json_data['nodes'][i]['eclass'])
-        
-        # Parse and validate node ID format
-        assert "." in i
-        id_parts = i.split(".")
-        assert len(id_parts) == 2
-        cid = id_parts[0]
-        nid = id_parts[1]
-        assert is_int(cid) and is_int(nid)
-        num_cid = int(cid)
-        num_nid = int(nid)
-        new_json_data['nodes'][i]['id'] = str(num_cid) + "." + str(num_nid)
-    
+    nodes = json_data['nodes']
+    for key, node in nodes.items():
+        if __debug__ and VALIDATE:
+            check_node(key, node)
+
+        # Convert children from "cid.nid" strings to integer eclass ids
+        node['children'] = [int(c[:c.index('.')]) for c in node['children']]
+        node['eclass'] = int(node['eclass'])
+        node['id'] = key  # already canonical "cid.nid"
+
     # Convert root_eclasses to integers
-    for i in new_json_data['root_eclasses']:
-        assert is_int(i)
-        new_json_data['root_eclasses'][new_json_data['root_eclasses'].index(i)] = int(i)
+    if __debug__ and VALIDATE:
+        assert all(is_int(i) for i in json_data['root_eclasses'])
+    json_data['root_eclasses'] = [int(x) for x in json_data['root_eclasses']]
     
     # Write the processed data to the new file
-    with open(new_filename, "w", encoding="utf-8") as file:
+    with open(new_filename, "wb") as file:
         print(f"Writing processed data to: {new_filename}")
-        json.dump(new_json_data, file, indent=4)
\ No newline at end of file
+        file.write(_dumps(json_data))
\ No newline at end of file